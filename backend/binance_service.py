@@ -1,46 +1,134 @@
 import asyncio
 import logging
+import os
 import random
-from typing import Optional
-from datetime import datetime, timezone
+from typing import Optional, Literal, get_args
+
+# websockets reads its reconnect backoff from the environment when its client
+# module is first imported, for every connection in the process; set the
+# defaults here so they apply without exporting anything before startup
+os.environ.setdefault("WEBSOCKETS_BACKOFF_MIN_DELAY", "1.92")
+os.environ.setdefault("WEBSOCKETS_BACKOFF_MAX_DELAY", "60")
+
+import httpx
+import orjson
+import websockets
+
+from price_stream import PriceStream
 
 logger = logging.getLogger(__name__)
 
-class BinanceWebSocketService:
-    """Service for simulated Bitcoin price (Binance geo-restricted)"""
-    
-    def __init__(self):
-        # Start with a realistic Bitcoin price
-        self.latest_price: Optional[float] = 98750.00
-        self.last_update: Optional[datetime] = None
-        self.connected = False
-    
+BINANCE_STREAM_URL = "wss://stream.binance.com:9443/ws/btcusdt@trade"
+BINANCE_TICKER_URL = "https://api.binance.com/api/v3/ticker/price"
+
+# Binance answers the WebSocket handshake with these when the host is geo-restricted
+RESTRICTED_STATUS_CODES = (403, 451)
+
+# Pause before restarting the stream after an error the library doesn't retry
+STREAM_RETRY_DELAY = 5.0
+
+REST_POLL_INTERVAL = 2.0
+
+# "ws" streams trades, "rest" polls the ticker, "sim" simulates prices offline
+PriceMode = Literal["ws", "rest", "sim"]
+
+class BinanceWebSocketService(PriceStream):
+    """Service for Bitcoin price from Binance, streamed, polled or simulated"""
+
+    name = "Binance"
+
+    def __init__(self, http_client: httpx.AsyncClient, mode: Optional[PriceMode] = None):
+        # Start with a realistic Bitcoin price until the stream delivers one
+        super().__init__(initial_price=98750.00)
+        self.http_client = http_client
+        self.mode = mode or os.environ.get("BINANCE_MODE", "ws")
+        if self.mode not in get_args(PriceMode):
+            logger.warning("Unknown BINANCE_MODE %r, using the WebSocket stream", self.mode)
+            self.mode = "ws"
+
     async def connect(self):
-        """Start simulating price updates"""
+        """Start price updates using the configured mode"""
         self.connected = True
-        logger.info("Starting Bitcoin price simulator (Binance API restricted)")
-        
+        loops = {"ws": self._ws_loop, "rest": self._rest_loop, "sim": self._sim_loop}
+        logger.info("Starting Binance price feed in %s mode", self.mode)
+        await loops[self.mode]()
+
+    async def _ws_loop(self):
+        """Stream trades over WebSocket, reseeding the price over REST on every (re)start"""
+        while self.connected:
+            # One-off REST call so latest_price is fresh before the stream connects
+            await self._fetch_price()
+
+            try:
+                # Iterating connect() reconnects on handshake failures with jittered
+                # exponential backoff (first retry uniform in [0, 5s], then x1.618,
+                # between 1.92s and 60s)
+                async for websocket in websockets.connect(BINANCE_STREAM_URL):
+                    self.websocket = websocket
+                    logger.info("Connected to Binance trade stream")
+                    try:
+                        await self._listen()
+                    except websockets.exceptions.ConnectionClosedError as e:
+                        # Reconnect now; if the server is down the handshake retries back off
+                        logger.warning("Binance stream dropped: %s", e)
+                    finally:
+                        self.websocket = None
+
+                    # A clean close (ConnectionClosedOK) ends _listen() normally;
+                    # reconnect straight away unless we are shutting down
+                    if not self.connected:
+                        return
+
+            except websockets.exceptions.InvalidStatus as e:
+                if e.response.status_code in RESTRICTED_STATUS_CODES:
+                    logger.warning("Binance stream restricted in this region, falling back to price simulator")
+                    await self._sim_loop()
+                    return
+                # e.g. 429/418 rate limiting, which the library doesn't retry
+                logger.error("Binance stream handshake rejected: %s", e)
+            except Exception as e:
+                logger.error("Binance stream stopped: %s", e)
+
+            if self.connected:
+                await asyncio.sleep(STREAM_RETRY_DELAY)
+
+    async def _rest_loop(self):
+        """Poll the REST ticker when streaming is unavailable"""
+        while self.connected:
+            await self._fetch_price()
+            await asyncio.sleep(REST_POLL_INTERVAL)
+
+    async def _fetch_price(self) -> bool:
+        """Fetch the ticker price over REST, returning whether it succeeded"""
+        try:
+            response = await self.http_client.get(BINANCE_TICKER_URL, params={"symbol": "BTCUSDT"}, timeout=10.0)
+            response.raise_for_status()
+            self._set_price(float(response.json()['price']))
+            return True
+        except Exception as e:
+            logger.error("Error fetching BTC price from Binance REST API: %s", e)
+            return False
+
+    async def _listen(self):
+        """Consume trade messages and keep the latest price"""
+        async for message in self.websocket:
+            data = orjson.loads(message)
+            self._set_price(float(data['p']))
+            logger.debug("BTC Price: $%.2f", self.latest_price)
+
+    async def _sim_loop(self):
+        """Simulate price updates when Binance is unreachable"""
         while self.connected:
             try:
                 # Simulate realistic price movement
                 change = random.uniform(-150, 150)
-                self.latest_price += change
-                self.latest_price = max(95000, min(102000, self.latest_price))  # Keep in reasonable range
-                
-                self.last_update = datetime.now(timezone.utc)
-                logger.debug(f"BTC Price (simulated): ${self.latest_price:.2f}")
-                
+                price = max(95000, min(102000, self.latest_price + change))  # Keep in reasonable range
+
+                self._set_price(price)
+                logger.debug("BTC Price (simulated): $%.2f", self.latest_price)
+
                 await asyncio.sleep(2)  # Update every 2 seconds
-                
+
             except Exception as e:
-                logger.error(f"Error in price simulation: {e}")
+                logger.error("Error in price simulation: %s", e)
                 await asyncio.sleep(5)
-    
-    def get_latest_price(self) -> Optional[float]:
-        """Get the most recent Bitcoin price"""
-        return self.latest_price
-    
-    async def disconnect(self):
-        """Stop simulation"""
-        self.connected = False
-        logger.info("Bitcoin price simulator stopped")
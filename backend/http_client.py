@@ -0,0 +1,9 @@
+import httpx
+
+# Bounded keep-alive pool shared by every request a client makes
+HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+HTTP_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create an HTTP/2 client with pooled keep-alive connections"""
+    return httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=HTTP_TIMEOUT)
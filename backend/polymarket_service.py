@@ -1,23 +1,79 @@
-import httpx
+import asyncio
 import logging
-from typing import Optional, Dict, List
+import random
+import re
+import time
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime, timezone
 
+import httpx
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# How long a fetched market price is served before refetching
+MARKET_PRICE_TTL = 5.0
+
+# How long a wallet's positions are served before refetching
+WALLET_POSITIONS_TTL = 3.0
+
+_BITCOIN_RE = re.compile(r'bitcoin', re.IGNORECASE)
+
+def _json_list(value: Any) -> List:
+    """Decode a Gamma list field, which the API sends as a JSON string"""
+    if isinstance(value, str):
+        return orjson.loads(value)
+    return value or []
+
 class PolymarketService:
     """Service for interacting with Polymarket APIs"""
     
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
         self.gamma_api = "https://gamma-api.polymarket.com"
         self.clob_api = "https://clob.polymarket.com"
         self.data_api = "https://data-api.polymarket.com"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        self.client = client
         self.bitcoin_market_cache = None
+        self._price_cache: Optional[Tuple[float, Dict]] = None  # (expires_at, price)
+        self._price_lock = asyncio.Lock()
+        self._etag_cache: Dict[Tuple, Tuple[str, Any]] = {}  # (url, params) -> (etag, body)
+        self._positions_cache: Dict[str, Tuple[float, Dict]] = {}  # address -> (expires_at, positions)
+        self._positions_locks: Dict[str, asyncio.Lock] = {}  # Only for fetches in flight
     
     async def get_bitcoin_market_price(self) -> Optional[Dict]:
-        """Get current Bitcoin 15-minute market price from Polymarket"""
+        """Get current Bitcoin 15-minute market price, cached for a few seconds"""
+        if self._price_cache and time.monotonic() < self._price_cache[0]:
+            return self._price_cache[1]
+        
+        if self._price_cache and self._price_lock.locked():
+            # A refresh is already in flight; serve the last price instead of queueing behind it
+            return self._price_cache[1]
+        
+        async with self._price_lock:
+            # Another caller may have refreshed the cache while we waited
+            if self._price_cache and time.monotonic() < self._price_cache[0]:
+                return self._price_cache[1]
+            
+            price = await self._fetch_bitcoin_market_price()
+            self._price_cache = (time.monotonic() + MARKET_PRICE_TTL, price)
+            return price
+    
+    async def _fetch_bitcoin_market_price(self) -> Optional[Dict]:
+        """Fetch current Bitcoin 15-minute market price from Polymarket"""
         try:
+            # Once the market is known, poll it directly instead of rescanning events
+            if self.bitcoin_market_cache:
+                url = f"{self.gamma_api}/markets/{self.bitcoin_market_cache.get('id')}"
+                market = await self._get_json(url)
+                
+                if market.get('active') and not market.get('closed') and market.get('outcomePrices'):
+                    self.bitcoin_market_cache = market
+                    return self._market_price(market)
+                
+                # Market resolved, look for the next one; its URL won't be polled again
+                self.bitcoin_market_cache = None
+                self._etag_cache.pop((url, ()), None)
+            
             # Search for Bitcoin markets
             url = f"{self.gamma_api}/events"
             params = {
@@ -26,57 +82,108 @@ class PolymarketService:
                 "limit": 50
             }
             
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
-            events = response.json()
+            events = await self._get_json(url, params)
             
             # Find Bitcoin 15-minute market
-            for event in events:
-                markets = event.get('markets', [])
-                for market in markets:
-                    question = market.get('question', '').lower()
-                    if 'bitcoin' in question and '15' in question:
-                        # Cache the market for future position queries
-                        self.bitcoin_market_cache = market
-                        
-                        # Get current price (YES token price)
-                        outcome_prices = market.get('outcomePrices', [])
-                        if outcome_prices:
-                            # Polymarket price is probability-based (0-1)
-                            # We'll return it as is for now
-                            return {
-                                'market_id': market.get('id'),
-                                'question': market.get('question'),
-                                'price': float(outcome_prices[0]) if outcome_prices else 0,
-                                'volume': float(market.get('volume', 0)),
-                                'outcomes': market.get('outcomes', [])
-                            }
+            market = self._find_bitcoin_market(events)
+            if market:
+                # Cache the market for future price and position queries
+                self.bitcoin_market_cache = market
+                return self._market_price(market)
             
             logger.warning("Bitcoin 15-minute market not found, using simulated data")
             # Return simulated data for demo
-            import random
-            return {
-                'market_id': 'simulated',
-                'question': 'Will Bitcoin go up in the next 15 minutes?',
-                'price': round(random.uniform(0.48, 0.68), 4),
-                'volume': 125000.0,
-                'outcomes': ['Yes', 'No']
-            }
+            return self._simulated_market_price()
             
         except Exception as e:
-            logger.error(f"Error fetching Polymarket Bitcoin price: {e}")
+            logger.error("Error fetching Polymarket Bitcoin price: %s", e)
             # Return simulated data as fallback
-            import random
-            return {
-                'market_id': 'simulated',
-                'question': 'Will Bitcoin go up in the next 15 minutes?',
-                'price': round(random.uniform(0.48, 0.68), 4),
-                'volume': 125000.0,
-                'outcomes': ['Yes', 'No']
-            }
+            return self._simulated_market_price()
+    
+    async def _get_json(self, url: str, params: Optional[Dict] = None) -> Any:
+        """GET a Gamma resource, revalidating the previous response by ETag"""
+        key = (url, tuple(sorted((params or {}).items())))
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        
+        response = await self.client.get(url, params=params, headers=headers)
+        if response.status_code == 304 and cached:
+            # Unchanged since the last fetch; nothing to download or parse
+            return cached[1]
+        response.raise_for_status()
+        data = response.json()
+        
+        etag = response.headers.get('etag')
+        if etag:
+            self._etag_cache[key] = (etag, data)
+        else:
+            self._etag_cache.pop(key, None)
+        return data
+    
+    def _find_bitcoin_market(self, events: List[Dict]) -> Optional[Dict]:
+        """Return the first priced Bitcoin 15-minute market, stopping at the first hit"""
+        return next(
+            (
+                market
+                for event in events
+                for market in event.get('markets', [])
+                if '15' in market.get('question', '')
+                and _BITCOIN_RE.search(market['question'])
+                and market.get('outcomePrices')
+            ),
+            None
+        )
+    
+    def _market_price(self, market: Dict) -> Dict:
+        """Build the price payload from a Gamma market"""
+        outcome_prices = _json_list(market.get('outcomePrices'))
+        # Polymarket price is probability-based (0-1)
+        # We'll return it as is for now
+        return {
+            'market_id': market.get('id'),
+            'question': market.get('question'),
+            'price': float(outcome_prices[0]) if outcome_prices else 0,
+            'volume': float(market.get('volume', 0)),
+            'outcomes': _json_list(market.get('outcomes'))
+        }
+    
+    def _simulated_market_price(self) -> Dict:
+        """Simulated market data used when the live market is unavailable"""
+        return {
+            'market_id': 'simulated',
+            'question': 'Will Bitcoin go up in the next 15 minutes?',
+            'price': round(random.uniform(0.48, 0.68), 4),
+            'volume': 125000.0,
+            'outcomes': ['Yes', 'No']
+        }
     
     async def get_wallet_positions(self, address: str) -> Dict:
-        """Get positions for a specific wallet address"""
+        """Get positions for a wallet, cached briefly per address"""
+        cached = self._positions_cache.get(address)
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
+        
+        # A burst of requests for the same wallet shares one upstream call
+        async with self._positions_locks.setdefault(address, asyncio.Lock()):
+            cached = self._positions_cache.get(address)
+            if cached and time.monotonic() < cached[0]:
+                return cached[1]
+            
+            try:
+                positions = await self._fetch_wallet_positions(address)
+            finally:
+                # Waiters on this lock recheck the cache; later callers get a new lock
+                self._positions_locks.pop(address, None)
+            
+            now = time.monotonic()
+            # Addresses are user input, so drop expired entries instead of keeping one per address forever
+            for key in [key for key, (expires_at, _) in self._positions_cache.items() if expires_at <= now]:
+                del self._positions_cache[key]
+            self._positions_cache[address] = (now + WALLET_POSITIONS_TTL, positions)
+            return positions
+    
+    async def _fetch_wallet_positions(self, address: str) -> Dict:
+        """Fetch positions for a specific wallet address"""
         try:
             # Note: This endpoint may require authentication for full access
             # For demo purposes, we'll return mock data structure
@@ -133,7 +240,3 @@ class PolymarketService:
         except Exception as e:
             logger.error(f"Error fetching wallet activity: {e}")
             return []
-    
-    async def close(self):
-        """Cleanup HTTP client resources"""
-        await self.client.aclose()
\ No newline at end of file
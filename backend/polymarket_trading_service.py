@@ -1,24 +1,51 @@
+import asyncio
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, List
 from py_clob_client.client import ClobClient
-from py_clob_client.clob_types import OrderArgs, OrderType
+from py_clob_client.clob_types import ApiCreds, OrderArgs, OrderType
+from py_clob_client.exceptions import PolyApiException
 from py_clob_client.order_builder.constants import BUY, SELL
 from datetime import datetime, timezone
+from cryptography.fernet import Fernet
 import httpx
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Only these mean stored credentials were rotated or revoked
+AUTH_FAILURE_STATUS_CODES = (401, 403)
+
+# py_clob_client does blocking network I/O; run it off the event loop on a
+# small pool so order flow can't starve other requests
+_clob_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="clob")
+
+async def _run_blocking(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(_clob_executor, func, *args)
+
 class PolymarketTradingService:
     """Service for automated trading on Polymarket"""
     
-    def __init__(self):
+    def __init__(self, http_client: httpx.AsyncClient, creds_collection=None):
         self.client: Optional[ClobClient] = None
         self.api_credentials = None
         self.connected = False
         self.user_address = None
         self.data_api = "https://data-api.polymarket.com"
-        self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.http_client = http_client
+        
+        # Derived L2 credentials are stored encrypted so reconnects skip derivation
+        self.creds_collection = creds_collection
+        encryption_key = os.getenv('API_CREDS_ENCRYPTION_KEY')
+        self._fernet = None
+        if encryption_key:
+            try:
+                self._fernet = Fernet(encryption_key)
+            except ValueError as e:
+                logger.error(f"Invalid API_CREDS_ENCRYPTION_KEY, API credentials will not be persisted: {e}")
+        elif creds_collection is not None:
+            logger.warning("API_CREDS_ENCRYPTION_KEY not set, API credentials will not be persisted")
     
     async def connect_account(self, private_key: str, proxy_address: str, signature_type: int = 0):
         """Connect Polymarket account with private key"""
@@ -31,8 +58,17 @@ class PolymarketTradingService:
                 funder=proxy_address
             )
             
-            # Derive L2 API credentials
-            self.api_credentials = self.client.create_or_derive_api_creds()
+            # Reuse stored L2 API credentials, deriving them only on first connect
+            signer_address = self.client.get_address()
+            self.api_credentials = await self._load_api_creds(signer_address, proxy_address)
+            if self.api_credentials and not await self._api_creds_valid(self.api_credentials):
+                # Rotated or revoked since they were stored
+                logger.info("Stored API credentials were rejected, deriving new ones")
+                await self._delete_api_creds(signer_address, proxy_address)
+                self.api_credentials = None
+            if not self.api_credentials:
+                self.api_credentials = await _run_blocking(self.client.create_or_derive_api_creds)
+                await self._store_api_creds(signer_address, proxy_address, self.api_credentials)
             self.client.set_api_creds(self.api_credentials)
             self.user_address = proxy_address
             self.connected = True
@@ -52,6 +88,66 @@ class PolymarketTradingService:
                 "error": str(e)
             }
     
+    async def _load_api_creds(self, signer_address: str, proxy_address: str) -> Optional[ApiCreds]:
+        """Fetch and decrypt previously derived credentials for this signer/proxy pair"""
+        if self.creds_collection is None or not self._fernet:
+            return None
+        
+        try:
+            # Keyed by signer too, so knowing a proxy address alone never unlocks its creds
+            doc = await self.creds_collection.find_one({"signer": signer_address, "address": proxy_address})
+            if not doc:
+                return None
+            
+            creds = orjson.loads(self._fernet.decrypt(doc['credentials']))
+            return ApiCreds(
+                api_key=creds['api_key'],
+                api_secret=creds['api_secret'],
+                api_passphrase=creds['api_passphrase']
+            )
+        except Exception as e:
+            logger.warning(f"Failed to load stored API credentials: {e}")
+            return None
+    
+    async def _api_creds_valid(self, creds: ApiCreds) -> bool:
+        """Check stored credentials with a cheap authenticated call"""
+        try:
+            self.client.set_api_creds(creds)
+            await _run_blocking(self.client.get_api_keys)
+            return True
+        except PolyApiException as e:
+            # Timeouts and server errors say nothing about the creds; let the caller report them
+            if e.status_code not in AUTH_FAILURE_STATUS_CODES:
+                raise
+            logger.warning(f"Stored API credentials failed validation: {e}")
+            return False
+    
+    async def _delete_api_creds(self, signer_address: str, proxy_address: str):
+        """Forget stored credentials so they are derived again"""
+        try:
+            await self.creds_collection.delete_one({"signer": signer_address, "address": proxy_address})
+        except Exception as e:
+            logger.warning(f"Failed to delete stored API credentials: {e}")
+    
+    async def _store_api_creds(self, signer_address: str, proxy_address: str, creds: ApiCreds):
+        """Encrypt and persist derived credentials"""
+        if self.creds_collection is None or not self._fernet:
+            return
+        
+        try:
+            token = self._fernet.encrypt(orjson.dumps({
+                'api_key': creds.api_key,
+                'api_secret': creds.api_secret,
+                'api_passphrase': creds.api_passphrase
+            }))
+            await self.creds_collection.update_one(
+                {"signer": signer_address, "address": proxy_address},
+                {"$set": {"credentials": token, "updated_at": datetime.now(timezone.utc)}},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store API credentials: {e}")
+    
     def is_connected(self) -> bool:
         return self.connected and self.client is not None
     
@@ -71,8 +167,8 @@ class PolymarketTradingService:
                 token_id=token_id
             )
             
-            signed_order = self.client.create_order(order_args)
-            response = self.client.post_order(signed_order, OrderType.FOK)  # Fill-or-Kill
+            signed_order = await _run_blocking(self.client.create_order, order_args)
+            response = await _run_blocking(self.client.post_order, signed_order, OrderType.FOK)  # Fill-or-Kill
             
             logger.info(f"Market order placed: {response}")
             return {
@@ -101,8 +197,8 @@ class PolymarketTradingService:
                 token_id=token_id
             )
             
-            signed_order = self.client.create_order(order_args)
-            response = self.client.post_order(signed_order, OrderType.GTC)  # Good-Till-Cancelled
+            signed_order = await _run_blocking(self.client.create_order, order_args)
+            response = await _run_blocking(self.client.post_order, signed_order, OrderType.GTC)  # Good-Till-Cancelled
             
             logger.info(f"Limit order placed: {response}")
             return {
@@ -126,7 +222,7 @@ class PolymarketTradingService:
         
         try:
             from py_clob_client.clob_types import OpenOrderParams
-            orders = self.client.get_orders(OpenOrderParams())
+            orders = await _run_blocking(self.client.get_orders, OpenOrderParams())
             return orders if orders else []
         except Exception as e:
             logger.error(f"Failed to fetch open orders: {e}")
@@ -138,7 +234,7 @@ class PolymarketTradingService:
             return {"success": False, "error": "Account not connected"}
         
         try:
-            response = self.client.cancel(order_id)
+            response = await _run_blocking(self.client.cancel, order_id)
             logger.info(f"Order cancelled: {order_id}")
             return {"success": True, "order_id": order_id}
         except Exception as e:
@@ -183,5 +279,4 @@ class PolymarketTradingService:
             return []
     
     async def close(self):
-        await self.http_client.aclose()
         self.connected = False
\ No newline at end of file
@@ -0,0 +1,138 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+import orjson
+import websockets
+
+from price_stream import PriceStream
+
+logger = logging.getLogger(__name__)
+
+POLYMARKET_MARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
+
+# How often to check whether the 15-minute market has rolled over
+MARKET_CHECK_INTERVAL = 5.0
+
+# The market channel expects an application-level "PING" about every 10 seconds
+PING_INTERVAL = 10.0
+
+class PolymarketWebSocketService(PriceStream):
+    """Service for streaming the Bitcoin 15-minute market price from the Polymarket CLOB"""
+
+    name = "Polymarket"
+
+    def __init__(self, polymarket_service):
+        super().__init__()
+        self.polymarket_service = polymarket_service
+        self.asset_id: Optional[str] = None
+
+    async def connect(self):
+        """Subscribe to the YES token of the current Bitcoin market"""
+        self.connected = True
+
+        while self.connected:
+            # The market is discovered over REST by PolymarketService
+            asset_id = self._market_asset_id()
+            if not asset_id:
+                await asyncio.sleep(MARKET_CHECK_INTERVAL)
+                continue
+
+            try:
+                async for websocket in websockets.connect(POLYMARKET_MARKET_WS_URL):
+                    self.websocket = websocket
+                    if asset_id != self.asset_id:
+                        self.asset_id = asset_id
+                        self.latest_price = None
+                    await websocket.send(orjson.dumps({"assets_ids": [asset_id], "type": "market"}).decode())
+                    logger.info("Subscribed to Polymarket market stream for asset %s", asset_id)
+
+                    try:
+                        await self._listen()
+                    except websockets.exceptions.ConnectionClosedOK:
+                        # recv() raises on a clean close too; reconnect straight away
+                        logger.info("Polymarket stream closed")
+                    except websockets.exceptions.ConnectionClosedError as e:
+                        logger.warning("Polymarket stream dropped: %s", e)
+                    finally:
+                        self.websocket = None
+
+                    # Resubscribe from scratch when the market rolls over
+                    if not self.connected or self._market_asset_id() != self.asset_id:
+                        break
+
+            except Exception as e:
+                logger.error("Polymarket stream error: %s", e)
+                await asyncio.sleep(MARKET_CHECK_INTERVAL)
+
+    async def _listen(self):
+        """Consume market events until the subscribed market changes"""
+        next_ping = time.monotonic() + PING_INTERVAL
+        while self.connected:
+            if time.monotonic() >= next_ping:
+                await self.websocket.send("PING")
+                next_ping = time.monotonic() + PING_INTERVAL
+
+            try:
+                message = await asyncio.wait_for(self.websocket.recv(), timeout=MARKET_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                message = None
+
+            if message and message != "PONG":
+                try:
+                    data = orjson.loads(message)
+                except orjson.JSONDecodeError:
+                    logger.debug("Skipping non-JSON Polymarket frame: %.100s", message)
+                    data = []
+                for event in data if isinstance(data, list) else [data]:
+                    if isinstance(event, dict):
+                        self._handle_event(event)
+
+            if self._market_asset_id() != self.asset_id:
+                logger.info("Polymarket Bitcoin market rolled over, resubscribing")
+                # The old market's price no longer applies
+                self.latest_price = None
+                return
+
+    def _handle_event(self, event: Dict):
+        """Update the latest price from price_change and last_trade_price events"""
+        event_type = event.get('event_type')
+        price = None
+
+        if event_type == 'price_change':
+            for change in event.get('price_changes', []):
+                if change.get('asset_id') != self.asset_id:
+                    continue
+                # Prefer the top-of-book midpoint over the changed level
+                if change.get('best_bid') and change.get('best_ask'):
+                    price = (float(change['best_bid']) + float(change['best_ask'])) / 2
+                else:
+                    price = float(change['price'])
+        elif event_type == 'last_trade_price' and event.get('asset_id') == self.asset_id:
+            price = float(event['price'])
+
+        if price is not None:
+            self._set_price(price)
+
+    async def get_market_price(self) -> Optional[float]:
+        """Streamed price, falling back to the REST snapshot until the stream has one"""
+        # Served from PolymarketService's TTL cache
+        polymarket_data = await self.polymarket_service.get_bitcoin_market_price()
+        if not polymarket_data:
+            return None
+        if self.latest_price is not None:
+            return self.latest_price
+        return polymarket_data.get('price', 0)
+
+    def _market_asset_id(self) -> Optional[str]:
+        """YES token id of the cached Bitcoin market, if a live one is known"""
+        market = self.polymarket_service.bitcoin_market_cache
+        if not market:
+            return None
+
+        token_ids = market.get('clobTokenIds')
+        # The Gamma API encodes this list as a JSON string
+        if isinstance(token_ids, str):
+            token_ids = orjson.loads(token_ids)
+        return token_ids[0] if token_ids else None
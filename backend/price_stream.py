@@ -0,0 +1,50 @@
+import logging
+import time
+from typing import Callable, List, Optional
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+class PriceStream:
+    """Latest-price state and change listeners shared by the streaming price services"""
+
+    name = "Price"
+
+    def __init__(self, initial_price: Optional[float] = None):
+        self.latest_price: Optional[float] = initial_price
+        self.last_update: Optional[float] = None  # Epoch seconds, formatted on read
+        self.connected = False
+        self.websocket = None
+        # Called synchronously on every price change, so they must be cheap
+        self._listeners: List[Callable[[], None]] = []
+
+    def _set_price(self, price: float):
+        """Record a new price and notify listeners"""
+        self.latest_price = price
+        self.last_update = time.time()
+        self._notify()
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Register a callback to run whenever the price changes"""
+        self._listeners.append(callback)
+
+    def _notify(self):
+        for callback in self._listeners:
+            callback()
+
+    def get_latest_price(self) -> Optional[float]:
+        """Get the most recent price"""
+        return self.latest_price
+
+    def get_last_update(self) -> Optional[datetime]:
+        """Get when the price last changed"""
+        if self.last_update is None:
+            return None
+        return datetime.fromtimestamp(self.last_update, timezone.utc)
+
+    async def disconnect(self):
+        """Close the stream"""
+        self.connected = False
+        if self.websocket:
+            await self.websocket.close()
+        logger.info("%s price stream stopped", self.name)
@@ -1,58 +1,104 @@
-from fastapi import FastAPI, APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
 from pathlib import Path
+from urllib.parse import parse_qs
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict
-import uuid
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime, timezone
 import socketio
 import asyncio
-import json
+import time
+import orjson
+import uvloop
 
 from binance_service import BinanceWebSocketService
 from polymarket_service import PolymarketService
+from polymarket_websocket_service import PolymarketWebSocketService
 from signal_service import SignalGeneratorService
 from polymarket_trading_service import PolymarketTradingService
 from wallet_tracking_service import WalletTrackingService
+from http_client import create_http_client
+from uuid_pool import fast_uuid
+
+# Event loops created after import (scripts, tests) also run on uvloop
+asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
 # MongoDB connection
 mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
+# tz_aware so stored dates come back as UTC-aware datetimes, like the ones we emit
+client = AsyncIOMotorClient(mongo_url, tz_aware=True)
 db = client[os.environ['DB_NAME']]
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
 
+class OrjsonPacketSerializer:
+    """json-module stand-in so Socket.IO encodes packets with orjson"""
+    
+    @staticmethod
+    def dumps(obj, *args, **kwargs):
+        # Socket.IO passes stdlib options like separators; orjson output is already compact
+        return orjson.dumps(obj).decode()
+    
+    @staticmethod
+    def loads(s, *args, **kwargs):
+        return orjson.loads(s)
+
 # Socket.IO server
 sio = socketio.AsyncServer(
     async_mode='asgi',
     cors_allowed_origins='*',
     logger=True,
-    engineio_logger=True
+    engineio_logger=True,
+    json=OrjsonPacketSerializer
 )
 
 # Global service instances
+http_client = None  # Pooled HTTP/2 client shared by the services
 binance_service: Optional[BinanceWebSocketService] = None
 polymarket_service: Optional[PolymarketService] = None
+polymarket_ws_service: Optional[PolymarketWebSocketService] = None
 signal_service: Optional[SignalGeneratorService] = None
 trading_service: Optional[PolymarketTradingService] = None
 wallet_tracking_service: Optional[WalletTrackingService] = None
 
+# Wallet list cache, dropped whenever the wallets collection changes
+_wallets_cache: Optional[List[Dict]] = None
+_wallets_lock = asyncio.Lock()
+# Bumped on every invalidation so a read that raced a write is not cached
+_wallets_generation = 0
+
+def invalidate_wallets_cache():
+    global _wallets_cache, _wallets_generation
+    _wallets_cache = None
+    _wallets_generation += 1
+
+# Recent signals per requested limit as (expires_at, signals), dropped on every insert
+SIGNALS_CACHE_TTL = 2.0
+SIGNALS_CACHE_MAXSIZE = 64
+# Larger pages are rare and too big to keep around
+SIGNALS_CACHE_MAX_LIMIT = 100
+_signals_cache: Dict[int, Tuple[float, List[Dict]]] = {}
+
+def invalidate_signals_cache():
+    _signals_cache.clear()
+
 # Define Models
 class Wallet(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=fast_uuid)
     address: str
     label: str
     added_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -64,7 +110,7 @@ class WalletCreate(BaseModel):
 class Signal(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    id: str = Field(default_factory=fast_uuid)
     signal_type: str  # "BUY" or "SELL"
     confidence: float
     reason: str
@@ -73,6 +119,10 @@ class Signal(BaseModel):
     price_delta: float
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+# Only the fields the API returns are read back from Mongo
+WALLET_PROJECTION = {"_id": 0, **{field: 1 for field in Wallet.model_fields}}
+SIGNAL_PROJECTION = {"_id": 0, **{field: 1 for field in Signal.model_fields}}
+
 class WalletActivity(BaseModel):
     model_config = ConfigDict(extra="ignore")
     
@@ -83,15 +133,69 @@ class WalletActivity(BaseModel):
     market: str
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
+def signal_payload(doc: Dict) -> Dict:
+    """Socket.IO payload for a signal document"""
+    # orjson encodes the datetime; only the '_id' Mongo adds in place on insert must go
+    return {k: v for k, v in doc.items() if k != '_id'}
+
+# SignalGeneratorService hands out the same signal to concurrent callers
+_last_published_signal_id: Optional[str] = None
+
+def claim_signal(signal) -> bool:
+    """True the first time a signal is seen, so coalesced signals are published once"""
+    global _last_published_signal_id
+    if signal.id == _last_published_signal_id:
+        return False
+    _last_published_signal_id = signal.id
+    return True
+
 # Socket.IO Events
+PRICE_ROOM = 'btc_prices'
+SIGNALS_ROOM = 'signals'
+SUBSCRIPTION_CHANNELS = {PRICE_ROOM, SIGNALS_ROOM}
+_price_subscribers = set()
+
+def wallet_room(address: str) -> str:
+    return f"wallet:{address.lower()}"
+
 @sio.event
 async def connect(sid, environ):
+    # Clients pass ?wallet=<address> to receive that wallet's trades
+    wallet = parse_qs(environ.get('QUERY_STRING', '')).get('wallet', [None])[0]
+    if wallet:
+        await sio.enter_room(sid, wallet_room(wallet))
     logging.info(f"Client connected: {sid}")
 
 @sio.event
 async def disconnect(sid):
+    _price_subscribers.discard(sid)
     logging.info(f"Client disconnected: {sid}")
 
+@sio.on('subscribe')
+async def subscribe(sid, data):
+    channel = data.get('channel') if isinstance(data, dict) else None
+    if channel not in SUBSCRIPTION_CHANNELS:
+        return {"success": False, "error": "Unknown channel"}
+    
+    await sio.enter_room(sid, channel)
+    if channel == PRICE_ROOM:
+        _price_subscribers.add(sid)
+        # Unchanged prices are not re-broadcast, so bring the new subscriber up to date
+        if _last_price_update:
+            await sio.emit('price_update', _last_price_update, to=sid)
+    return {"success": True, "channel": channel}
+
+@sio.on('unsubscribe')
+async def unsubscribe(sid, data):
+    channel = data.get('channel') if isinstance(data, dict) else None
+    if channel not in SUBSCRIPTION_CHANNELS:
+        return {"success": False, "error": "Unknown channel"}
+    
+    await sio.leave_room(sid, channel)
+    if channel == PRICE_ROOM:
+        _price_subscribers.discard(sid)
+    return {"success": True, "channel": channel}
+
 # API Routes
 @api_router.get("/")
 async def root():
@@ -102,26 +206,37 @@ async def health_check():
     return {
         "status": "healthy",
         "binance_connected": binance_service.connected if binance_service else False,
+        "binance_last_update": binance_service.get_last_update() if binance_service else None,
         "services_initialized": all([binance_service, polymarket_service, signal_service])
     }
 
 # Wallet Management
 @api_router.post("/wallets", response_model=Wallet)
 async def add_wallet(input: WalletCreate):
-    wallet_obj = Wallet(**input.model_dump())
+    wallet_obj = Wallet(address=input.address, label=input.label)
     doc = wallet_obj.model_dump()
-    doc['added_at'] = doc['added_at'].isoformat()
     
     await db.wallets.insert_one(doc)
+    invalidate_wallets_cache()
     return wallet_obj
 
 @api_router.get("/wallets", response_model=List[Wallet])
 async def get_wallets():
-    wallets = await db.wallets.find({}, {"_id": 0}).to_list(1000)
+    global _wallets_cache
     
-    for wallet in wallets:
-        if isinstance(wallet['added_at'], str):
-            wallet['added_at'] = datetime.fromisoformat(wallet['added_at'])
+    if _wallets_cache is not None:
+        return _wallets_cache
+    
+    async with _wallets_lock:
+        if _wallets_cache is not None:
+            return _wallets_cache
+        
+        generation = _wallets_generation
+        cursor = db.wallets.find({}, WALLET_PROJECTION).batch_size(200)
+        wallets = await cursor.to_list(1000)
+        # A write committed during the read may be missing from this list
+        if generation == _wallets_generation:
+            _wallets_cache = wallets
     
     return wallets
 
@@ -130,43 +245,57 @@ async def delete_wallet(wallet_id: str):
     result = await db.wallets.delete_one({"id": wallet_id})
     if result.deleted_count == 0:
         raise HTTPException(status_code=404, detail="Wallet not found")
+    invalidate_wallets_cache()
     return {"message": "Wallet deleted"}
 
 # Price Data
 @api_router.get("/prices/current")
 async def get_current_prices():
-    if not binance_service or not polymarket_service:
+    if not binance_service or not polymarket_ws_service:
         raise HTTPException(status_code=503, detail="Services not initialized")
     
     binance_price = binance_service.get_latest_price()
-    polymarket_data = await polymarket_service.get_bitcoin_market_price()
+    # Same price source as price_update broadcasts and signals
+    polymarket_price = await polymarket_ws_service.get_market_price()
     
     if binance_price is None:
         raise HTTPException(status_code=503, detail="Binance price not available")
     
     price_delta = 0
-    polymarket_price = 0
     
-    if polymarket_data:
-        polymarket_price = polymarket_data.get('price', 0)
+    if polymarket_price is not None:
         price_delta = binance_price - polymarket_price
+    else:
+        polymarket_price = 0
     
     return {
         "binance_price": binance_price,
         "polymarket_price": polymarket_price,
         "price_delta": price_delta,
-        "timestamp": datetime.now(timezone.utc).isoformat()
+        "timestamp": datetime.now(timezone.utc)
     }
 
 # Signals
 @api_router.get("/signals", response_model=List[Signal])
-async def get_signals(limit: int = 20):
-    signals = await db.signals.find({}, {"_id": 0}).sort("timestamp", -1).to_list(limit)
-    
-    for signal in signals:
-        if isinstance(signal['timestamp'], str):
-            signal['timestamp'] = datetime.fromisoformat(signal['timestamp'])
-    
+async def get_signals(response: Response, limit: int = 20):
+    # The dashboard refetches right after generating a signal, so browsers must not reuse the list
+    response.headers["Cache-Control"] = "no-cache"
+    
+    now = time.monotonic()
+    cached = _signals_cache.get(limit)
+    if cached and cached[0] > now:
+        return cached[1]
+    
+    cursor = db.signals.find({}, SIGNAL_PROJECTION).sort("timestamp", -1).limit(limit)
+    signals = await cursor.to_list(limit)
+    
+    if 0 < limit <= SIGNALS_CACHE_MAX_LIMIT:
+        for key in [key for key, (expires_at, _) in _signals_cache.items() if expires_at <= now]:
+            del _signals_cache[key]
+        if len(_signals_cache) >= SIGNALS_CACHE_MAXSIZE:
+            # Dicts keep insertion order, so this drops the oldest entry
+            del _signals_cache[next(iter(_signals_cache))]
+        _signals_cache[limit] = (now + SIGNALS_CACHE_TTL, signals)
     return signals
 
 @api_router.post("/signals/generate")
@@ -177,13 +306,22 @@ async def generate_signal():
     signal = await signal_service.generate_signal()
     
     if signal:
+        if not claim_signal(signal):
+            # Coalesced with a signal that was already broadcast; if it is still
+            # queued, wait for its write so a follow-up GET /signals includes it
+            pending_write = _pending_signal_writes.get(signal.id)
+            if pending_write:
+                await pending_write.wait()
+            return signal
+        
         # Save to database
+        # Stored with a native datetime so the timestamp index sorts chronologically
         doc = signal.model_dump()
-        doc['timestamp'] = doc['timestamp'].isoformat()
         await db.signals.insert_one(doc)
+        invalidate_signals_cache()
         
         # Broadcast to all connected clients
-        await sio.emit('new_signal', json.loads(json.dumps(doc, default=str)))
+        await sio.emit('new_signal', signal_payload(doc), room=SIGNALS_ROOM)
         
         return signal
     else:
@@ -258,8 +396,8 @@ async def place_market_order(order: MarketOrderRequest):
     )
     
     if result.get('success'):
-        # Broadcast trade to all clients
-        await sio.emit('new_trade', result)
+        # Only clients following this wallet receive its trades
+        await sio.emit('new_trade', result, room=wallet_room(trading_service.user_address))
     
     return result
 
@@ -279,7 +417,7 @@ async def place_limit_order(order: LimitOrderRequest):
     )
     
     if result.get('success'):
-        await sio.emit('new_trade', result)
+        await sio.emit('new_trade', result, room=wallet_room(trading_service.user_address))
     
     return result
 
@@ -344,72 +482,256 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Background task for price monitoring and signal generation
-async def monitor_prices():
-    """Background task to monitor prices and generate signals"""
+# Price tick handling and signal generation
+PRICE_BROADCAST_COOLDOWN = 0.1  # Coalesce trade ticks into at most ~10 broadcasts/sec
+BINANCE_PRICE_EPSILON = 0.5  # USD
+POLYMARKET_PRICE_EPSILON = 0.0005  # Probability, below the market's price tick
+SIGNAL_CHECK_INTERVAL = 5.0
+
+_last_price_update: Optional[Dict] = None
+_next_signal_check = 0.0
+_price_tick_task: Optional[asyncio.Task] = None
+_price_tick_pending = False
+_auto_signal_task: Optional[asyncio.Task] = None
+_shutting_down = False
+
+def price_changed(binance_price: float, polymarket_price: float) -> bool:
+    """Whether either price moved enough since the last broadcast to be worth sending"""
+    if not _last_price_update:
+        return True
+    return (
+        abs(binance_price - _last_price_update['binance_price']) >= BINANCE_PRICE_EPSILON
+        or abs(polymarket_price - _last_price_update['polymarket_price']) >= POLYMARKET_PRICE_EPSILON
+    )
+
+def on_price_tick():
+    """Price stream listener; ticks arriving while one is being handled are coalesced"""
+    global _price_tick_task, _price_tick_pending
+    if _shutting_down:
+        return
+    if _price_tick_task and not _price_tick_task.done():
+        _price_tick_pending = True
+        return
+    _price_tick_task = asyncio.create_task(process_price_ticks())
+
+async def process_price_ticks():
+    """Handle the latest prices, then again after a cooldown if more ticks arrived"""
+    global _price_tick_pending
     while True:
+        _price_tick_pending = False
         try:
-            if binance_service and polymarket_service and signal_service:
-                binance_price = binance_service.get_latest_price()
-                
-                if binance_price:
-                    polymarket_data = await polymarket_service.get_bitcoin_market_price()
-                    
-                    if polymarket_data:
-                        polymarket_price = polymarket_data.get('price', 0)
-                        price_delta = binance_price - polymarket_price
-                        
-                        # Broadcast price updates
-                        await sio.emit('price_update', {
-                            'binance_price': binance_price,
-                            'polymarket_price': polymarket_price,
-                            'price_delta': price_delta,
-                            'timestamp': datetime.now(timezone.utc).isoformat()
-                        })
-                        
-                        # Auto-generate signal if price delta is significant
-                        if abs(price_delta) > 100:  # If delta > $100
-                            signal = await signal_service.generate_signal()
-                            if signal:
-                                doc = signal.model_dump()
-                                doc['timestamp'] = doc['timestamp'].isoformat()
-                                await db.signals.insert_one(doc)
-                                await sio.emit('new_signal', json.loads(json.dumps(doc, default=str)))
+            await handle_price_tick()
+        except Exception as e:
+            logger.error("Error in price monitoring: %s", e)
+        
+        await asyncio.sleep(PRICE_BROADCAST_COOLDOWN)
+        if not _price_tick_pending:
+            break
+
+async def handle_price_tick():
+    """Broadcast current prices and generate signals"""
+    global _last_price_update, _next_signal_check
+    
+    if not (binance_service and polymarket_ws_service and signal_service):
+        return
+    
+    binance_price = binance_service.get_latest_price()
+    
+    if binance_price:
+        polymarket_price = await polymarket_ws_service.get_market_price()
+        
+        if polymarket_price is not None:
+            price_delta = binance_price - polymarket_price
+            
+            # Broadcast price updates to subscribed clients only, skipping flat ticks
+            if _price_subscribers and price_changed(binance_price, polymarket_price):
+                _last_price_update = {
+                    'binance_price': binance_price,
+                    'polymarket_price': polymarket_price,
+                    'price_delta': price_delta,
+                    'timestamp': datetime.now(timezone.utc)
+                }
+                # A room emit encodes the packet once for all recipients
+                await sio.emit('price_update', _last_price_update, room=PRICE_ROOM)
             
-            await asyncio.sleep(5)  # Check every 5 seconds
+            # Auto-generate signal if price delta is significant (at most every 5s)
+            if time.monotonic() >= _next_signal_check and abs(price_delta) > 100:  # If delta > $100
+                _next_signal_check = time.monotonic() + SIGNAL_CHECK_INTERVAL
+                schedule_auto_signal()
+
+def schedule_auto_signal():
+    """Generate a signal in the background so the LLM call never holds up price broadcasts"""
+    global _auto_signal_task
+    if _auto_signal_task and not _auto_signal_task.done():
+        return
+    _auto_signal_task = asyncio.create_task(auto_generate_signal())
+
+async def auto_generate_signal():
+    try:
+        signal = await signal_service.generate_signal()
+        if signal and claim_signal(signal):
+            # Emit right away; the DB write is batched by flush_signals()
+            doc = signal.model_dump()
+            _pending_signal_writes[signal.id] = asyncio.Event()
+            _signal_queue.put_nowait(doc)
+            await sio.emit('new_signal', signal_payload(doc), room=SIGNALS_ROOM)
+    except Exception as e:
+        logger.error("Error generating auto signal: %s", e)
+
+# Auto-generated signals are written in batches off the monitoring loop
+SIGNAL_BATCH_SIZE = 50
+SIGNAL_FLUSH_INTERVAL = 0.5
+# None is queued at shutdown to stop the flusher once everything before it is written
+_signal_queue: asyncio.Queue = asyncio.Queue()
+_signal_flush_task: Optional[asyncio.Task] = None
+# Set once a queued signal's batch has been written, keyed by signal id
+_pending_signal_writes: Dict[str, asyncio.Event] = {}
+
+async def store_signals(batch: List[Dict]):
+    try:
+        await db.signals.insert_many(batch, ordered=False)
+        invalidate_signals_cache()
+    except Exception as e:
+        logger.error(f"Failed to store {len(batch)} signals: {e}")
+    finally:
+        for doc in batch:
+            pending_write = _pending_signal_writes.pop(doc['id'], None)
+            if pending_write:
+                pending_write.set()
+
+async def flush_signals():
+    """Background task draining queued signals into batched inserts"""
+    stopping = False
+    while not stopping:
+        doc = await _signal_queue.get()
+        if doc is None:
+            break
+        
+        batch = [doc]
+        deadline = time.monotonic() + SIGNAL_FLUSH_INTERVAL
+        while len(batch) < SIGNAL_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                doc = await asyncio.wait_for(_signal_queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            if doc is None:
+                stopping = True
+                break
+            batch.append(doc)
+        
+        await store_signals(batch)
+
+async def drain_signal_queue():
+    """Write out any signals still queued at shutdown"""
+    global _signal_flush_task
+    if _signal_flush_task:
+        # Ask the flusher to stop rather than cancelling it, so an insert in flight completes
+        _signal_queue.put_nowait(None)
+        await _signal_flush_task
+        _signal_flush_task = None
+    
+    batch = []
+    while not _signal_queue.empty():
+        doc = _signal_queue.get_nowait()
+        if doc is not None:
+            batch.append(doc)
+    if batch:
+        await store_signals(batch)
+
+async def ensure_indexes():
+    """Create collections and indexes backing the hot queries"""
+    try:
+        # Only the latest signals are ever read, so bound the collection
+        if "signals" not in await db.list_collection_names():
+            await db.create_collection("signals", capped=True, size=10_000_000, max=100_000)
+        await db.signals.create_index([("timestamp", -1)])
+        await db.wallets.create_index("id", unique=True)
+        await db.api_creds.create_index([("signer", 1), ("address", 1)], unique=True)
+    except Exception as e:
+        logger.error(f"Failed to create indexes: {e}")
+
+async def migrate_string_timestamps():
+    """Convert ISO-string timestamps written by older versions into BSON dates"""
+    for collection, field in ((db.signals, "timestamp"), (db.wallets, "added_at")):
+        try:
+            # One server-side pipeline update per collection instead of a round trip per doc;
+            # strings that don't parse are left as they are instead of failing the whole update
+            result = await collection.update_many(
+                {field: {"$type": "string"}},
+                [{"$set": {field: {"$convert": {"input": "$" + field, "to": "date", "onError": "$" + field}}}}]
+            )
+            if result.modified_count:
+                logger.info(f"Migrated {result.modified_count} {collection.name}.{field} values to dates")
         except Exception as e:
-            logger.error(f"Error in price monitoring: {e}")
-            await asyncio.sleep(5)
+            logger.error(f"Failed to migrate {collection.name}.{field}: {e}")
+
+async def watch_wallets():
+    """Invalidate the wallet cache on writes made by other processes"""
+    try:
+        async with db.wallets.watch() as stream:
+            async for _ in stream:
+                invalidate_wallets_cache()
+    except Exception as e:
+        # Change streams need a replica set; single-process writes still invalidate
+        logger.info(f"Wallet change stream unavailable: {e}")
 
 @app.on_event("startup")
 async def startup():
-    global binance_service, polymarket_service, signal_service, trading_service, wallet_tracking_service
+    global _signal_flush_task, http_client, binance_service, polymarket_service, polymarket_ws_service, signal_service, trading_service, wallet_tracking_service
     
     logger.info("Starting services...")
     
+    await ensure_indexes()
+    await migrate_string_timestamps()
+    
     # Initialize services
-    binance_service = BinanceWebSocketService()
-    polymarket_service = PolymarketService()
-    signal_service = SignalGeneratorService(binance_service, polymarket_service)
-    trading_service = PolymarketTradingService()
-    wallet_tracking_service = WalletTrackingService()
+    http_client = create_http_client()
+    binance_service = BinanceWebSocketService(http_client)
+    polymarket_service = PolymarketService(http_client)
+    polymarket_ws_service = PolymarketWebSocketService(polymarket_service)
+    signal_service = SignalGeneratorService(binance_service, polymarket_service, polymarket_ws_service)
+    trading_service = PolymarketTradingService(http_client, db.api_creds)
+    wallet_tracking_service = WalletTrackingService(http_client)
     
     # Start Binance WebSocket in background
     asyncio.create_task(binance_service.connect())
     
-    # Start price monitoring
-    asyncio.create_task(monitor_prices())
+    # Start Polymarket market stream in background
+    asyncio.create_task(polymarket_ws_service.connect())
+    
+    # Broadcast prices and generate signals as either stream ticks
+    binance_service.add_listener(on_price_tick)
+    polymarket_ws_service.add_listener(on_price_tick)
+    _signal_flush_task = asyncio.create_task(flush_signals())
+    
+    asyncio.create_task(watch_wallets())
     
     logger.info("Services started successfully")
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    global _shutting_down
+    _shutting_down = True
     if binance_service:
         await binance_service.disconnect()
+    if polymarket_ws_service:
+        await polymarket_ws_service.disconnect()
+    # Stop tick handling and any LLM call in flight so nothing is queued after the drain
+    for task in (_price_tick_task, _auto_signal_task):
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+    await drain_signal_queue()
     if trading_service:
         await trading_service.close()
-    if wallet_tracking_service:
-        await wallet_tracking_service.close()
+    if http_client:
+        await http_client.aclose()
     client.close()
 
 # Wrap FastAPI with Socket.IO
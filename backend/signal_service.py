@@ -1,13 +1,29 @@
+import asyncio
 import logging
 import os
-from typing import Optional
+import re
+import time
+from typing import Optional, Tuple
 from datetime import datetime, timezone
 from emergentintegrations.llm.chat import LlmChat, UserMessage
-from pydantic import BaseModel
-import json
+from pydantic import BaseModel, ValidationError
+
+from uuid_pool import fast_uuid
 
 logger = logging.getLogger(__name__)
 
+# Requests within this window of the last signal get that signal back
+SIGNAL_MEMO_TTL = 1.0
+
+# JSON object inside a ``` / ```json fence, or a bare object
+_JSON_PAYLOAD_RE = re.compile(r"```(?:json)?\s*(\{.*?\})\s*```|(\{.*\})", re.DOTALL)
+
+class SignalMessage(BaseModel):
+    """Fields the model is asked to return"""
+    signal_type: str
+    confidence: float
+    reason: str
+
 class Signal(BaseModel):
     id: str
     signal_type: str
@@ -21,9 +37,14 @@ class Signal(BaseModel):
 class SignalGeneratorService:
     """Service for generating AI-powered trading signals"""
     
-    def __init__(self, binance_service, polymarket_service):
+    def __init__(self, binance_service, polymarket_service, polymarket_ws_service):
         self.binance_service = binance_service
         self.polymarket_service = polymarket_service
+        # Source of the market price, so signals match what clients were shown
+        self.polymarket_ws_service = polymarket_ws_service
+        self._signal_lock = asyncio.Lock()
+        self._last_signal: Optional[Tuple[float, Signal]] = None  # (generated_at, signal)
+        self._coalesced_signal_id: Optional[str] = None
         
         # Initialize OpenAI GPT-5.2 via Emergent LLM key
         api_key = os.getenv('EMERGENT_LLM_KEY')
@@ -54,17 +75,32 @@ Be concise and actionable."""
         self.llm.with_model("openai", "gpt-5.2")
     
     async def generate_signal(self) -> Optional[Signal]:
+        """Generate a trading signal, coalescing concurrent and back-to-back requests"""
+        async with self._signal_lock:
+            if self._last_signal and time.monotonic() - self._last_signal[0] < SIGNAL_MEMO_TTL:
+                signal = self._last_signal[1]
+                if self._coalesced_signal_id != signal.id:
+                    self._coalesced_signal_id = signal.id
+                    logger.info(f"Coalesced duplicate signal request into {signal.id}")
+                return signal
+            
+            signal = await self._generate_signal()
+            if signal:
+                self._last_signal = (time.monotonic(), signal)
+            return signal
+    
+    async def _generate_signal(self) -> Optional[Signal]:
         """Generate a trading signal based on current market data"""
         try:
             # Get current prices
             binance_price = self.binance_service.get_latest_price()
             polymarket_data = await self.polymarket_service.get_bitcoin_market_price()
+            polymarket_price = await self.polymarket_ws_service.get_market_price()
             
-            if not binance_price or not polymarket_data:
+            if not binance_price or not polymarket_data or polymarket_price is None:
                 logger.warning("Insufficient data to generate signal")
                 return None
             
-            polymarket_price = polymarket_data.get('price', 0)
             price_delta = binance_price - polymarket_price
             
             # Create analysis prompt
@@ -83,20 +119,17 @@ Respond ONLY with valid JSON, no additional text."""
             # Parse AI response
             try:
                 # Extract JSON from response
-                response_text = response.strip()
-                if '```json' in response_text:
-                    response_text = response_text.split('```json')[1].split('```')[0].strip()
-                elif '```' in response_text:
-                    response_text = response_text.split('```')[1].split('```')[0].strip()
+                match = _JSON_PAYLOAD_RE.search(response)
+                payload = (match.group(1) or match.group(2)) if match else response
                 
-                signal_data = json.loads(response_text)
+                # Parse and validate in one pass in pydantic-core
+                signal_data = SignalMessage.model_validate_json(payload)
                 
-                import uuid
                 signal = Signal(
-                    id=str(uuid.uuid4()),
-                    signal_type=signal_data['signal_type'],
-                    confidence=float(signal_data['confidence']),
-                    reason=signal_data['reason'],
+                    id=fast_uuid(),
+                    signal_type=signal_data.signal_type,
+                    confidence=signal_data.confidence,
+                    reason=signal_data.reason,
                     binance_price=binance_price,
                     polymarket_price=polymarket_price,
                     price_delta=price_delta,
@@ -106,8 +139,8 @@ Respond ONLY with valid JSON, no additional text."""
                 logger.info(f"Generated signal: {signal.signal_type} (confidence: {signal.confidence})")
                 return signal
                 
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse AI response as JSON: {e}")
+            except ValidationError as e:
+                logger.error(f"Failed to parse AI response as a signal: {e}")
                 logger.error(f"Response: {response}")
                 return None
             
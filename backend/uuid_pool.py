@@ -0,0 +1,24 @@
+import os
+import threading
+import uuid
+
+# Random bytes are read from the OS in bulk and handed out 16 at a time
+_POOL_SIZE = 4096
+
+_rand_pool = bytearray()
+_pool_lock = threading.Lock()
+
+def _reset_pool():
+    # A forked child must not hand out the same bytes as its parent
+    _rand_pool.clear()
+
+os.register_at_fork(after_in_child=_reset_pool)
+
+def fast_uuid() -> str:
+    """Random (version 4) UUID string, drawing on a shared urandom pool"""
+    with _pool_lock:
+        if len(_rand_pool) < 16:
+            _rand_pool.extend(os.urandom(_POOL_SIZE))
+        b = bytes(_rand_pool[:16])
+        del _rand_pool[:16]
+    return str(uuid.UUID(bytes=b, version=4))
@@ -1,17 +1,27 @@
 import httpx
 import logging
+import numpy as np
+import orjson
 from typing import List, Dict, Optional
 from datetime import datetime, timezone
 
 logger = logging.getLogger(__name__)
 
+POSITION_FIELDS = ('size', 'currentValue', 'unrealizedPnl', 'realizedPnl')
+
+def _extract_position_fields(positions: List[Dict]) -> np.ndarray:
+    """Read the numeric position fields into an (n, 4) array in one pass"""
+    rows = (tuple(float(p.get(field, 0)) for field in POSITION_FIELDS) for p in positions)
+    return np.fromiter(rows, dtype=np.dtype((np.float64, len(POSITION_FIELDS))), count=len(positions))
+
 class WalletTrackingService:
     """Enhanced service for tracking external wallets with detailed position data"""
     
-    def __init__(self):
+    def __init__(self, client: httpx.AsyncClient):
         self.data_api = "https://data-api.polymarket.com"
         self.gamma_api = "https://gamma-api.polymarket.com"
-        self.client = httpx.AsyncClient(timeout=30.0)
+        # Shared HTTP/2 client: concurrent wallet queries multiplex over one connection
+        self.client = client
     
     async def get_wallet_detailed_positions(self, address: str) -> Dict:
         """Get detailed position breakdown for a wallet"""
@@ -21,25 +31,19 @@ class WalletTrackingService:
             
             response = await self.client.get(url, params=params)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
             
             positions = data if isinstance(data, list) else data.get('data', [])
             
-            # Categorize positions into buying and selling
-            buying_positions = []
-            selling_positions = []
+            # One row per position: size, value, unrealized and realized PnL
+            fields = _extract_position_fields(positions)
             
-            for pos in positions:
-                size = float(pos.get('size', 0))
-                if size > 0:
-                    buying_positions.append(pos)
-                elif size < 0:
-                    selling_positions.append(pos)
+            # Categorize positions into buying and selling
+            buying_positions = [p for p, is_buy in zip(positions, (fields[:, 0] > 0).tolist()) if is_buy]
+            selling_positions = [p for p, is_sell in zip(positions, (fields[:, 0] < 0).tolist()) if is_sell]
             
-            # Calculate metrics
-            total_value = sum(float(p.get('currentValue', 0)) for p in positions)
-            total_pnl = sum(float(p.get('unrealizedPnl', 0)) for p in positions)
-            realized_pnl = sum(float(p.get('realizedPnl', 0)) for p in positions)
+            # Calculate metrics with a single column-wise reduction
+            _, total_value, total_pnl, realized_pnl = fields.sum(axis=0).tolist()
             
             return {
                 'address': address,
@@ -97,8 +101,11 @@ class WalletTrackingService:
             }
         ]
         
-        total_value = sum(p['current_value'] for p in buying_positions + selling_positions)
-        total_unrealized_pnl = sum(p['unrealized_pnl'] for p in buying_positions + selling_positions)
+        all_positions = buying_positions + selling_positions
+        values = np.array([p['current_value'] for p in all_positions], dtype=np.float64)
+        unrealized = np.array([p['unrealized_pnl'] for p in all_positions], dtype=np.float64)
+        total_value = float(values.sum())
+        total_unrealized_pnl = float(unrealized.sum())
         realized_pnl = random.uniform(-5, 15)
         
         return {
@@ -120,7 +127,7 @@ class WalletTrackingService:
             
             response = await self.client.get(url, params=params)
             response.raise_for_status()
-            trades = response.json()
+            trades = orjson.loads(response.content)
             
             return trades if trades else self._get_simulated_activity(address, limit)
             
@@ -130,10 +137,8 @@ class WalletTrackingService:
     
     def _get_simulated_activity(self, address: str, limit: int) -> List[Dict]:
         """Generate simulated activity feed"""
-        import random
         from datetime import timedelta
         
-        activities = []
         base_time = datetime.now(timezone.utc)
         
         markets = [
@@ -142,21 +147,26 @@ class WalletTrackingService:
             'Trump wins 2026 election',
             'S&P 500 below 5000'
         ]
+        actions = ['BUY', 'SELL']
+        outcomes = ['Yes', 'No']
         
-        for i in range(min(limit, 20)):
-            action = random.choice(['BUY', 'SELL'])
-            market = random.choice(markets)
-            
-            activities.append({
-                'action': action,
-                'market': market,
-                'outcome': 'Yes' if random.random() > 0.5 else 'No',
-                'shares': round(random.uniform(10, 200), 1),
-                'price': round(random.uniform(0.35, 0.75), 4),
-                'timestamp': (base_time - timedelta(minutes=i*15)).isoformat()
-            })
+        # Draw every random column in one batch rather than per row
+        rng = np.random.default_rng()
+        n = max(0, min(limit, 20))
+        shares = rng.uniform(10, 200, n).round(1).tolist()
+        prices = rng.uniform(0.35, 0.75, n).round(4).tolist()
+        action_idx = rng.integers(0, 2, n).tolist()
+        market_idx = rng.integers(0, len(markets), n).tolist()
+        outcome_idx = rng.integers(0, 2, n).tolist()
         
-        return activities
-    
-    async def close(self):
-        await self.client.aclose()
\ No newline at end of file
+        return [
+            {
+                'action': actions[action_idx[i]],
+                'market': markets[market_idx[i]],
+                'outcome': outcomes[outcome_idx[i]],
+                'shares': shares[i],
+                'price': prices[i],
+                'timestamp': (base_time - timedelta(minutes=i*15)).isoformat()
+            }
+            for i in range(n)
+        ]
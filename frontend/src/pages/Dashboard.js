@@ -46,6 +46,9 @@ export default function Dashboard() {
 
     socketRef.current.on('connect', () => {
       console.log('Socket.IO connected');
+      // Updates are only sent to subscribed clients (re-sent on reconnect)
+      socketRef.current.emit('subscribe', { channel: 'btc_prices' });
+      socketRef.current.emit('subscribe', { channel: 'signals' });
     });
 
     socketRef.current.on('price_update', (data) => {